@@ -5,9 +5,11 @@ Main application file with UI and user interactions
 Coded by Nate
 """
 
+import re
 import streamlit as st
 import pandas as pd
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Tuple
 from recommender import MovieRecommender
 from data_loader import TMDBDataLoader
 import utils
@@ -22,8 +24,7 @@ st.set_page_config(
 )
 
 # Enhanced CSS for visual improvements
-st.markdown("""
-    <style>
+CUSTOM_CSS = """
     /* Overall styling */
     .main {
         padding: 1rem 2rem;
@@ -209,8 +210,20 @@ st.markdown("""
         border-radius: 8px;
         border-left: 3px solid #E50914;
     }
-    </style>
-    """, unsafe_allow_html=True)
+"""
+
+
+@st.cache_resource
+def get_custom_css() -> str:
+    """Minify the page stylesheet once per server process."""
+    css = re.sub(r'/\*.*?\*/', '', CUSTOM_CSS, flags=re.DOTALL)  # Strip comments
+    css = re.sub(r'\s+', ' ', css)  # Collapse whitespace
+    css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)  # Trim around punctuation
+    return f"<style>{css.strip()}</style>"
+
+
+# Streamlit rebuilds the page on every rerun, so the stylesheet is re-emitted each time
+st.markdown(get_custom_css(), unsafe_allow_html=True)
 
 
 # Genre color mapping
@@ -229,8 +242,9 @@ GENRE_COLORS = {
 }
 
 
-def get_genre_badges_html(genres: List[str]) -> str:
-    """Generate HTML for colorful genre badges."""
+@lru_cache(maxsize=1024)
+def get_genre_badges_html(genres: Tuple[str, ...]) -> str:
+    """Generate (and memoize) HTML for colorful genre badges."""
     badges = []
     for genre in genres[:4]:  # Limit to 4 genres
         css_class = GENRE_COLORS.get(genre, 'genre-badge')
@@ -238,9 +252,9 @@ def get_genre_badges_html(genres: List[str]) -> str:
     return ' '.join(badges)
 
 
-@st.cache_data(ttl=3600)
+@st.cache_resource(ttl=3600)
 def load_movie_data() -> pd.DataFrame:
-    """Load and cache movie dataset from TMDB or local cache file."""
+    """Load and cache movie dataset from TMDB or local cache file (shared, not pickled per rerun)."""
     loader = TMDBDataLoader()
     return loader.load_popular_movies(num_movies=500)
 
@@ -251,6 +265,21 @@ def initialize_recommender(_movie_data: pd.DataFrame) -> MovieRecommender:
     return MovieRecommender(_movie_data)
 
 
+@st.cache_resource
+def build_title_index(_movie_data: pd.DataFrame) -> Dict[str, Dict]:
+    """Build and cache a title -> movie lookup (first match wins for duplicate titles)."""
+    title_index = {}
+    for movie in _movie_data.to_dict('records'):
+        title_index.setdefault(movie['title'], movie)
+    return title_index
+
+
+@st.cache_resource
+def get_title_options(_title_index: Dict[str, Dict]) -> List[str]:
+    """Sort and cache the dropdown options: a blank placeholder followed by the (unique) movie titles."""
+    return [""] + sorted(_title_index)
+
+
 def display_movie_card(movie: Dict, explanation: str = None, delay: int = 0, card_id: str = None):
     """
     Display a styled movie card with poster, title, and details.
@@ -276,7 +305,7 @@ def display_movie_card(movie: Dict, explanation: str = None, delay: int = 0, car
     
     with col2:
         # Title and year
-        year = movie.get('year', 'N/A')
+        year = utils.format_year(movie.get('year'))
         title = movie['title']
         st.markdown(f"### {title} ({year})")
         
@@ -288,7 +317,7 @@ def display_movie_card(movie: Dict, explanation: str = None, delay: int = 0, car
         
         # Genre badges
         if movie.get('genres'):
-            genre_html = get_genre_badges_html(movie['genres'])
+            genre_html = get_genre_badges_html(tuple(movie['genres'][:4]))
             st.markdown(genre_html, unsafe_allow_html=True)
         
         # Recommendation explanation
@@ -399,6 +428,7 @@ def main():
     with st.spinner("Loading movie database..."):
         movie_data = load_movie_data()
         recommender = initialize_recommender(movie_data)
+        title_index = build_title_index(movie_data)
     loading_msg.empty()
     
     st.success(f"✅ Loaded {len(movie_data)} movies")
@@ -427,7 +457,7 @@ def main():
             for movie_key, movie in watchlist.items():
                 st.markdown(
                     f'<div class="watchlist-item">'
-                    f'<strong>{movie["title"]}</strong> ({movie.get("year", "N/A")})'
+                    f'<strong>{movie["title"]}</strong> ({utils.format_year(movie.get("year"))})'
                     f'</div>',
                     unsafe_allow_html=True
                 )
@@ -446,8 +476,8 @@ def main():
     st.markdown("## 🎯 Step 1: Select Your Favorite Movies")
     st.write("Start typing a movie name to search, then select from the dropdown:")
     
-    # Create searchable movie list
-    movie_titles = sorted(movie_data['title'].tolist())
+    # Create searchable movie list (shared by every selectbox, built once)
+    title_options = get_title_options(title_index)
     selected_movies = []
     
     # Number of selections
@@ -462,7 +492,7 @@ def main():
     for i in range(num_selections):
         selected = st.selectbox(
             f"🎬 Movie {i+1}",
-            options=[""] + movie_titles,
+            options=title_options,
             key=f"movie_{i}",
             help="Start typing to filter the list"
         )
@@ -474,7 +504,7 @@ def main():
         st.markdown("### 🎥 Your Selection:")
         cols = st.columns(min(len(selected_movies), 5))
         for idx, movie_title in enumerate(selected_movies):
-            movie_info = movie_data[movie_data['title'] == movie_title].iloc[0].to_dict()
+            movie_info = title_index[movie_title]
             with cols[idx % len(cols)]:
                 st.markdown('<div class="selected-movie">', unsafe_allow_html=True)
                 if movie_info.get('poster_url'):
@@ -6,59 +6,78 @@ Fetches from multiple sources to ensure classics and popular films are included.
 Usage: python build_cache.py
 """
 
-import json
 import os
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from movie_cache import (
+    CACHE_FILE, create_session, parse_json, read_cached_json, save_cache, write_cached_json
+)
 
 # Load environment variables
 load_dotenv()
 
-CACHE_FILE = "movies_cache.json"
 BASE_URL = "https://api.themoviedb.org/3"
 IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w500"
+MAX_WORKERS = 20  # Concurrent detail fetches (keeps us within TMDB rate limits)
+DETAILS_CACHE_DIR = ".tmdb_cache"
+DETAILS_CACHE_TTL = 7 * 24 * 60 * 60  # Re-fetch movie details older than a week
+
+# Shared session so every request reuses pooled keep-alive connections (with retries)
+session = create_session(MAX_WORKERS)
 
 
 def get_movie_details(api_key: str, movie_id: int) -> dict:
-    """Fetch full details for a single movie."""
+    """Fetch full details for a single movie, reusing fresh on-disk cache entries."""
+    cache_path = os.path.join(DETAILS_CACHE_DIR, f"{movie_id}.json")
+    cached = read_cached_json(cache_path, DETAILS_CACHE_TTL)
+    if cached is not None:
+        return cached
+    
+    movie = _fetch_movie_details(api_key, movie_id)
+    if movie and movie.get('id'):
+        write_cached_json(cache_path, movie)
+    return movie
+
+
+def _fetch_movie_details(api_key: str, movie_id: int) -> dict:
+    """Fetch full details for a single movie from TMDB."""
     try:
-        # Get movie details
-        movie_resp = requests.get(
+        # Get movie details and credits in a single request
+        movie_resp = session.get(
             f"{BASE_URL}/movie/{movie_id}",
-            params={'api_key': api_key}
+            params={'api_key': api_key, 'append_to_response': 'credits'}
         )
-        movie = movie_resp.json()
+        movie_resp.raise_for_status()
+        movie = parse_json(movie_resp)
+        credits = movie.get('credits') or {}
         
-        # Get credits
-        credits_resp = requests.get(
-            f"{BASE_URL}/movie/{movie_id}/credits",
-            params={'api_key': api_key}
+        # Extract director (stop at the first match)
+        director = next(
+            (p['name'] for p in credits.get('crew') or [] if p['job'] == 'Director'), None
         )
-        credits = credits_resp.json()
-        
-        # Extract director
-        director = None
-        if credits.get('crew'):
-            directors = [p for p in credits['crew'] if p['job'] == 'Director']
-            if directors:
-                director = directors[0]['name']
         
         # Extract cast
         cast = [p['name'] for p in credits.get('cast', [])[:5]]
         
+        # Only these fields are kept; the rest of the TMDB payload is ignored
+        release_date = movie.get('release_date')
+        poster_path = movie.get('poster_path')
+        
         return {
             'id': movie.get('id'),
             'title': movie.get('title'),
-            'year': movie.get('release_date', '')[:4] if movie.get('release_date') else None,
+            'year': release_date[:4] if release_date else None,
             'overview': movie.get('overview'),
             'genres': [g['name'] for g in movie.get('genres', [])],
             'rating': movie.get('vote_average'),
             'vote_count': movie.get('vote_count'),
-            'poster_url': f"{IMAGE_BASE_URL}{movie['poster_path']}" if movie.get('poster_path') else None,
+            'poster_url': f"{IMAGE_BASE_URL}{poster_path}" if poster_path else None,
             'director': director,
             'cast': cast
         }
     except Exception as e:
+        print(f"\n    [WARN] Could not fetch details for movie {movie_id}: {e}")
         return None
 
 
@@ -68,49 +87,64 @@ def fetch_movies_from_endpoint(api_key: str, endpoint: str, params: dict,
     movies = []
     pages_needed = (max_movies // 20) + 1
     
-    for page in range(1, min(pages_needed + 1, 26)):
+    def fetch_page(page: int) -> requests.Response:
         request_params = {'api_key': api_key, 'page': page, **params}
-        response = requests.get(f"{BASE_URL}{endpoint}", params=request_params)
-        
-        if response.status_code != 200:
-            continue
-            
-        data = response.json()
-        
-        for movie_data in data.get('results', []):
-            movie_id = movie_data['id']
-            
-            # Skip if we already have this movie
-            if movie_id in seen_ids:
-                continue
-            
-            movie = get_movie_details(api_key, movie_id)
-            if movie and movie.get('overview') and movie.get('genres'):
-                movies.append(movie)
-                seen_ids.add(movie_id)
-                # Use ASCII-safe printing for Windows console
-                safe_title = movie['title'].encode('ascii', 'replace').decode('ascii')
-                print(f"    + {safe_title} ({movie['year']})".ljust(60), end="\r")
+        return session.get(f"{BASE_URL}{endpoint}", params=request_params)
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # Request all pages up front; they are consumed in order below and any
+        # still pending are cancelled once we have enough movies
+        page_futures = [
+            executor.submit(fetch_page, page) for page in range(1, min(pages_needed + 1, 26))
+        ]
+        try:
+            for page, page_future in enumerate(page_futures, start=1):
+                response = page_future.result()
                 
-            if len(movies) >= max_movies:
-                break
-        
-        if len(movies) >= max_movies:
-            break
+                if response.status_code != 200:
+                    print(f"\n    [WARN] Skipping {endpoint} page {page}: HTTP {response.status_code}")
+                    continue
+                    
+                data = parse_json(response)
+                
+                # Skip movies we already have, then fetch the rest of the page concurrently
+                new_ids = list(dict.fromkeys(
+                    m['id'] for m in data.get('results', []) if m['id'] not in seen_ids
+                ))
+                details = executor.map(lambda movie_id: get_movie_details(api_key, movie_id), new_ids)
+                
+                for movie_id, movie in zip(new_ids, details):
+                    if movie and movie.get('overview') and movie.get('genres'):
+                        movies.append(movie)
+                        seen_ids.add(movie_id)
+                        # Use ASCII-safe printing for Windows console
+                        safe_title = movie['title'].encode('ascii', 'replace').decode('ascii')
+                        print(f"    + {safe_title} ({movie['year']})".ljust(60), end="\r")
+                        
+                    if len(movies) >= max_movies:
+                        return movies
+                
+                # Stop early when the endpoint has no more pages
+                total_pages = data.get('total_pages')
+                if total_pages and page >= total_pages:
+                    break
+        finally:
+            for page_future in page_futures:
+                page_future.cancel()
     return movies
 
 
 def search_movie_by_title(api_key: str, title: str, seen_ids: set) -> dict:
     """Search for a specific movie by title and return its details."""
     try:
-        response = requests.get(
+        response = session.get(
             f"{BASE_URL}/search/movie",
             params={'api_key': api_key, 'query': title}
         )
         if response.status_code != 200:
             return None
         
-        results = response.json().get('results', [])
+        results = parse_json(response).get('results', [])
         if not results:
             return None
         
@@ -245,9 +279,19 @@ def build_cache():
     # 7. MUST-HAVE CLASSICS (search by title)
     print("\n[7/8] Adding must-have classic movies...")
     must_have_added = 0
-    for title in MUST_HAVE_MOVIES:
-        movie = search_movie_by_title(api_key, title, seen_ids)
-        if movie:
+    # Only search for titles we don't already have (saves a request per hit)
+    seen_titles = {m['title'].casefold() for m in all_movies}
+    missing_titles = [t for t in MUST_HAVE_MOVIES if t.casefold() not in seen_titles]
+    # Search all titles concurrently; each search gets its own copy of seen_ids
+    # so workers don't race on it, and duplicates are dropped below instead
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        found = list(executor.map(
+            lambda title: search_movie_by_title(api_key, title, set(seen_ids)),
+            missing_titles
+        ))
+    for movie in found:
+        if movie and movie['id'] not in seen_ids:
+            seen_ids.add(movie['id'])
             all_movies.append(movie)
             must_have_added += 1
             safe_title = movie['title'].encode('ascii', 'replace').decode('ascii')
@@ -258,8 +302,7 @@ def build_cache():
     print(f"\n\n[OK] Total unique movies: {len(all_movies)}")
     
     # Save to JSON
-    with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_movies, f, ensure_ascii=False, indent=2)
+    save_cache(all_movies)
     
     print(f"[OK] Saved to {CACHE_FILE}")
     print(f"\n[DONE] The app will now load {len(all_movies)} movies instantly!")
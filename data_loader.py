@@ -6,13 +6,249 @@ Handles loading movie data from TMDB API or local datasets
 import pandas as pd
 import requests
 from typing import List, Dict, Optional
+import hashlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from movie_cache import create_session, load_cache, read_cached_json, write_cached_json
 
 # Load environment variables
 load_dotenv()
 
+# Columns of the movies DataFrame, in order
+MOVIE_COLUMNS = ['id', 'title', 'year', 'overview', 'genres', 'rating',
+                 'vote_count', 'poster_url', 'director', 'cast']
+
+# Fields returned by TMDBDataLoader.get_movie_details (poster_path is turned into poster_url)
+DETAIL_FIELDS = ['poster_path' if name == 'poster_url' else name for name in MOVIE_COLUMNS]
+
+# Compact dtypes for the movies DataFrame (pandas defaults to int64/float64/object)
+COMPACT_DTYPES = {'id': 'int32', 'vote_count': 'int32', 'rating': 'float32'}
+
+
+def _to_year(years: pd.Series) -> pd.Series:
+    """Convert a column of year strings to nullable Int16 (<NA> where missing)."""
+    return pd.to_numeric(years, errors='coerce').astype('Int16')
+
+
+def _optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast movie columns to compact dtypes to cut DataFrame memory.
+    
+    The release year is stored as a nullable Int16 so it can be compared
+    numerically; unparseable or missing years become <NA>. The director is
+    kept as object dtype with None where missing, so records and payloads
+    built from the frame never carry a (truthy) NaN.
+    
+    Args:
+        df: Movies DataFrame
+        
+    Returns:
+        DataFrame with downcast columns (integer columns with missing values are left as-is)
+    """
+    dtypes = {
+        col: dtype for col, dtype in COMPACT_DTYPES.items()
+        if col in df.columns and not (dtype == 'int32' and df[col].isna().any())
+    }
+    df = df.astype(dtypes)
+    if 'year' in df.columns:
+        df['year'] = _to_year(df['year'])
+    if 'director' in df.columns:
+        df['director'] = df['director'].astype(object).where(df['director'].notna(), None)
+    return df
+
+
+# This is a small sample dataset for testing without API key
+# In production, you might load from a CSV or use IMDb dataset
+SAMPLE_MOVIES = [
+    {
+        'id': 1,
+        'title': 'The Shawshank Redemption',
+        'year': '1994',
+        'overview': 'Two imprisoned men bond over a number of years, finding solace and eventual redemption through acts of common decency.',
+        'genres': ['Drama', 'Crime'],
+        'rating': 8.7,
+        'vote_count': 2000000,
+        'poster_url': None,
+        'director': 'Frank Darabont',
+        'cast': ['Tim Robbins', 'Morgan Freeman']
+    },
+    {
+        'id': 2,
+        'title': 'The Godfather',
+        'year': '1972',
+        'overview': 'The aging patriarch of an organized crime dynasty transfers control of his clandestine empire to his reluctant son.',
+        'genres': ['Drama', 'Crime'],
+        'rating': 8.7,
+        'vote_count': 1500000,
+        'poster_url': None,
+        'director': 'Francis Ford Coppola',
+        'cast': ['Marlon Brando', 'Al Pacino']
+    },
+    {
+        'id': 3,
+        'title': 'The Dark Knight',
+        'year': '2008',
+        'overview': 'When the menace known as the Joker wreaks havoc and chaos on the people of Gotham, Batman must accept one of the greatest psychological and physical tests of his ability to fight injustice.',
+        'genres': ['Action', 'Crime', 'Drama'],
+        'rating': 9.0,
+        'vote_count': 2500000,
+        'poster_url': None,
+        'director': 'Christopher Nolan',
+        'cast': ['Christian Bale', 'Heath Ledger', 'Aaron Eckhart']
+    },
+    {
+        'id': 4,
+        'title': 'Inception',
+        'year': '2010',
+        'overview': 'A thief who steals corporate secrets through dream-sharing technology is given the inverse task of planting an idea into the mind of a C.E.O.',
+        'genres': ['Action', 'Sci-Fi', 'Thriller'],
+        'rating': 8.8,
+        'vote_count': 2200000,
+        'poster_url': None,
+        'director': 'Christopher Nolan',
+        'cast': ['Leonardo DiCaprio', 'Joseph Gordon-Levitt', 'Elliot Page']
+    },
+    {
+        'id': 5,
+        'title': 'Pulp Fiction',
+        'year': '1994',
+        'overview': 'The lives of two mob hitmen, a boxer, a gangster and his wife, and a pair of diner bandits intertwine in four tales of violence and redemption.',
+        'genres': ['Crime', 'Drama'],
+        'rating': 8.9,
+        'vote_count': 1900000,
+        'poster_url': None,
+        'director': 'Quentin Tarantino',
+        'cast': ['John Travolta', 'Uma Thurman', 'Samuel L. Jackson']
+    },
+    {
+        'id': 6,
+        'title': 'Forrest Gump',
+        'year': '1994',
+        'overview': 'The presidencies of Kennedy and Johnson, the Vietnam War, the Watergate scandal and other historical events unfold from the perspective of an Alabama man with an IQ of 75.',
+        'genres': ['Drama', 'Romance'],
+        'rating': 8.8,
+        'vote_count': 1950000,
+        'poster_url': None,
+        'director': 'Robert Zemeckis',
+        'cast': ['Tom Hanks', 'Robin Wright', 'Gary Sinise']
+    },
+    {
+        'id': 7,
+        'title': 'The Matrix',
+        'year': '1999',
+        'overview': 'A computer hacker learns from mysterious rebels about the true nature of his reality and his role in the war against its controllers.',
+        'genres': ['Action', 'Sci-Fi'],
+        'rating': 8.7,
+        'vote_count': 1850000,
+        'poster_url': None,
+        'director': 'Lana Wachowski',
+        'cast': ['Keanu Reeves', 'Laurence Fishburne', 'Carrie-Anne Moss']
+    },
+    {
+        'id': 8,
+        'title': 'Interstellar',
+        'year': '2014',
+        'overview': 'A team of explorers travel through a wormhole in space in an attempt to ensure humanity\'s survival.',
+        'genres': ['Adventure', 'Drama', 'Sci-Fi'],
+        'rating': 8.6,
+        'vote_count': 1800000,
+        'poster_url': None,
+        'director': 'Christopher Nolan',
+        'cast': ['Matthew McConaughey', 'Anne Hathaway', 'Jessica Chastain']
+    },
+    {
+        'id': 9,
+        'title': 'Fight Club',
+        'year': '1999',
+        'overview': 'An insomniac office worker and a devil-may-care soap maker form an underground fight club that evolves into much more.',
+        'genres': ['Drama'],
+        'rating': 8.8,
+        'vote_count': 2000000,
+        'poster_url': None,
+        'director': 'David Fincher',
+        'cast': ['Brad Pitt', 'Edward Norton', 'Helena Bonham Carter']
+    },
+    {
+        'id': 10,
+        'title': 'Goodfellas',
+        'year': '1990',
+        'overview': 'The story of Henry Hill and his life in the mob, covering his relationship with his wife Karen Hill and his mob partners.',
+        'genres': ['Crime', 'Drama'],
+        'rating': 8.7,
+        'vote_count': 1100000,
+        'poster_url': None,
+        'director': 'Martin Scorsese',
+        'cast': ['Robert De Niro', 'Ray Liotta', 'Joe Pesci']
+    },
+    {
+        'id': 11,
+        'title': 'The Silence of the Lambs',
+        'year': '1991',
+        'overview': 'A young F.B.I. cadet must receive the help of an incarcerated and manipulative cannibal killer to help catch another serial killer.',
+        'genres': ['Crime', 'Drama', 'Thriller'],
+        'rating': 8.6,
+        'vote_count': 1300000,
+        'poster_url': None,
+        'director': 'Jonathan Demme',
+        'cast': ['Jodie Foster', 'Anthony Hopkins']
+    },
+    {
+        'id': 12,
+        'title': 'Gladiator',
+        'year': '2000',
+        'overview': 'A former Roman General sets out to exact vengeance against the corrupt emperor who murdered his family and sent him into slavery.',
+        'genres': ['Action', 'Adventure', 'Drama'],
+        'rating': 8.5,
+        'vote_count': 1400000,
+        'poster_url': None,
+        'director': 'Ridley Scott',
+        'cast': ['Russell Crowe', 'Joaquin Phoenix', 'Connie Nielsen']
+    },
+    {
+        'id': 13,
+        'title': 'The Prestige',
+        'year': '2006',
+        'overview': 'After a tragic accident, two stage magicians engage in a battle to create the ultimate illusion while sacrificing everything they have.',
+        'genres': ['Drama', 'Mystery', 'Sci-Fi'],
+        'rating': 8.5,
+        'vote_count': 1250000,
+        'poster_url': None,
+        'director': 'Christopher Nolan',
+        'cast': ['Christian Bale', 'Hugh Jackman', 'Scarlett Johansson']
+    },
+    {
+        'id': 14,
+        'title': 'The Departed',
+        'year': '2006',
+        'overview': 'An undercover cop and a mole in the police attempt to identify each other while infiltrating an Irish gang in South Boston.',
+        'genres': ['Crime', 'Drama', 'Thriller'],
+        'rating': 8.5,
+        'vote_count': 1200000,
+        'poster_url': None,
+        'director': 'Martin Scorsese',
+        'cast': ['Leonardo DiCaprio', 'Matt Damon', 'Jack Nicholson']
+    },
+    {
+        'id': 15,
+        'title': 'Saving Private Ryan',
+        'year': '1998',
+        'overview': 'Following the Normandy Landings, a group of U.S. soldiers go behind enemy lines to retrieve a paratrooper whose brothers have been killed in action.',
+        'genres': ['Drama', 'War'],
+        'rating': 8.6,
+        'vote_count': 1300000,
+        'poster_url': None,
+        'director': 'Steven Spielberg',
+        'cast': ['Tom Hanks', 'Matt Damon', 'Tom Sizemore']
+    }
+]
+
+# Built once at import rather than on every fallback
+_SAMPLE_MOVIES_DF = _optimize_dtypes(pd.DataFrame(SAMPLE_MOVIES))
+
 
 class TMDBDataLoader:
     """
@@ -23,6 +259,10 @@ class TMDBDataLoader:
     
     BASE_URL = "https://api.themoviedb.org/3"
     IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w500"
+    MAX_WORKERS = 16  # Concurrent API requests (keeps us within TMDB rate limits)
+    REQUEST_TIMEOUT = (3.05, 15)  # (connect, read) seconds, so a stalled request can't hang the app
+    RESPONSE_CACHE_DIR = os.path.join(".tmdb_cache", "responses")
+    RESPONSE_CACHE_TTL = 7 * 24 * 60 * 60  # Re-fetch cached responses older than a week
     
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -40,14 +280,29 @@ class TMDBDataLoader:
                 "⚠️ TMDB API key not found. Using sample dataset. "
                 "For full functionality, add your API key to .env file."
             )
+        
+        # Shared session so requests reuse pooled keep-alive connections (with retries;
+        # a request that still fails is reported through raise_for_status)
+        self._session = create_session(self.MAX_WORKERS)
+        self._session.headers.update({'Accept': 'application/json'})
+        self._session.params = {'api_key': self.api_key}
+    
+    def _response_cache_path(self, endpoint: str, params: Dict) -> str:
+        """Get the on-disk cache file for an endpoint + query parameters."""
+        key = json.dumps([endpoint, sorted(params.items())], default=str)
+        return os.path.join(self.RESPONSE_CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".json")
     
-    def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
+    def _make_request(self, endpoint: str, params: Dict = None, force_refresh: bool = False) -> Dict:
         """
         Make authenticated request to TMDB API.
         
+        Responses are cached on disk (keyed by endpoint + params) for a week,
+        so warm starts don't hit the API again.
+        
         Args:
             endpoint: API endpoint (e.g., '/movie/popular')
             params: Query parameters
+            force_refresh: Bypass the on-disk cache and re-fetch
             
         Returns:
             JSON response as dictionary
@@ -58,15 +313,37 @@ class TMDBDataLoader:
         if params is None:
             params = {}
         
-        params['api_key'] = self.api_key
+        cache_path = self._response_cache_path(endpoint, params)
+        if not force_refresh:
+            cached = read_cached_json(cache_path, self.RESPONSE_CACHE_TTL)
+            if cached is not None:
+                return cached
         
         try:
-            response = requests.get(f"{self.BASE_URL}{endpoint}", params=params)
+            response = self._session.get(
+                f"{self.BASE_URL}{endpoint}", params=params, timeout=self.REQUEST_TIMEOUT
+            )
             response.raise_for_status()
-            return response.json()
+            data = response.json()
         except requests.exceptions.RequestException as e:
             st.error(f"API request failed: {e}")
             return {}
+        
+        write_cached_json(cache_path, data)
+        return data
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        """
+        Create a thread pool for concurrent API requests.
+        
+        Workers are attached to the current Streamlit script run so that
+        warnings raised while fetching still reach the page.
+        """
+        return ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS,
+            initializer=add_script_run_ctx,
+            initargs=(None, get_script_run_ctx())
+        )
     
     def get_movie_details(self, movie_id: int) -> Dict:
         """
@@ -76,32 +353,33 @@ class TMDBDataLoader:
             movie_id: TMDB movie ID
             
         Returns:
-            Dictionary with movie details including cast and crew
+            Dictionary with movie details including cast and crew. The poster
+            is the raw TMDB poster_path, relative to IMAGE_BASE_URL.
         """
-        movie = self._make_request(f"/movie/{movie_id}")
-        credits = self._make_request(f"/movie/{movie_id}/credits")
-        
-        # Extract director
-        director = None
-        if credits.get('crew'):
-            directors = [person for person in credits['crew'] if person['job'] == 'Director']
-            if directors:
-                director = directors[0]['name']
+        # Fetch details and credits in a single request
+        movie = self._make_request(f"/movie/{movie_id}", {'append_to_response': 'credits'})
+        credits = movie.get('credits') or {}
+        
+        # Extract director (stop at the first match)
+        director = next(
+            (person['name'] for person in credits.get('crew') or [] if person['job'] == 'Director'),
+            None
+        )
         
         # Extract top cast
-        cast = []
-        if credits.get('cast'):
-            cast = [person['name'] for person in credits['cast'][:5]]
+        cast = [person['name'] for person in (credits.get('cast') or [])[:5]]
+        
+        release_date = movie.get('release_date')
         
         return {
             'id': movie.get('id'),
             'title': movie.get('title'),
-            'year': movie.get('release_date', '')[:4] if movie.get('release_date') else None,
+            'year': release_date[:4] if release_date else None,
             'overview': movie.get('overview'),
-            'genres': [g['name'] for g in movie.get('genres', [])],
+            'genres': [g['name'] for g in movie.get('genres') or []],
             'rating': movie.get('vote_average'),
             'vote_count': movie.get('vote_count'),
-            'poster_url': f"{self.IMAGE_BASE_URL}{movie['poster_path']}" if movie.get('poster_path') else None,
+            'poster_path': movie.get('poster_path') or None,
             'director': director,
             'cast': cast
         }
@@ -116,16 +394,15 @@ class TMDBDataLoader:
         Returns:
             DataFrame with movie information
         """
-        # First, check if we have a local cache file
-        import json
-        cache_file = "movies_cache.json"
+        # First, check if we have a local cache file (the newer of the plain and gzipped copies)
+        cache_files = [path for path in ("movies_cache.json", "movies_cache.json.gz") if os.path.exists(path)]
+        cache_file = max(cache_files, key=os.path.getmtime, default=None)
         
-        if os.path.exists(cache_file):
+        if cache_file:
             try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cached_movies = json.load(f)
+                cached_movies = load_cache(cache_file)
                 st.success(f"⚡ Loaded {len(cached_movies)} movies from cache (instant!)")
-                return pd.DataFrame(cached_movies)
+                return _optimize_dtypes(pd.DataFrame(cached_movies))
             except Exception as e:
                 st.warning(f"Cache file corrupted, fetching from API... ({e})")
         
@@ -133,59 +410,77 @@ class TMDBDataLoader:
             # Fallback to sample dataset if no API key
             return self._load_sample_dataset()
         
-        movies = []
+        # Collect column-wise so the DataFrame is built once from whole columns
+        columns = {name: [] for name in DETAIL_FIELDS}
         pages_needed = (num_movies // 20) + 1  # TMDB returns 20 movies per page
+        pages = range(1, min(pages_needed + 1, 26))  # TMDB limits to 500 pages
         
         # Show progress
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        for page in range(1, min(pages_needed + 1, 26)):  # TMDB limits to 500 pages
-            status_text.text(f"Loading movies... Page {page}/{pages_needed}")
-            progress_bar.progress(page / pages_needed)
-            
-            response = self._make_request("/movie/popular", {'page': page})
-            
-            if not response.get('results'):
-                break
+        with self._executor() as executor:
+            # Fetch the listing pages concurrently, stopping at the first empty page
+            status_text.text(f"Loading movies... {len(pages)} pages")
+            popular_movies = []
+            responses = executor.map(
+                lambda page: self._make_request("/movie/popular", {'page': page}), pages
+            )
+            for response in responses:
+                if not response.get('results'):
+                    break
+                popular_movies.extend(response['results'])
+            popular_movies = popular_movies[:num_movies]
             
-            for movie_data in response['results']:
+            # Then get full details for all of them, updating progress as they complete
+            futures = {
+                executor.submit(self.get_movie_details, movie_data['id']): i
+                for i, movie_data in enumerate(popular_movies)
+            }
+            details = [None] * len(popular_movies)
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
                 try:
-                    # Get full details for each movie
-                    movie = self.get_movie_details(movie_data['id'])
-                    movies.append(movie)
-                    
-                    if len(movies) >= num_movies:
-                        break
+                    details[i] = future.result()
                 except Exception as e:
-                    st.warning(f"Failed to load movie {movie_data.get('title')}: {e}")
-                    continue
-            
-            if len(movies) >= num_movies:
-                break
+                    st.warning(f"Failed to load movie {popular_movies[i].get('title')}: {e}")
+                status_text.text(f"Loading movies... {done}/{len(popular_movies)}")
+                progress_bar.progress(done / len(popular_movies))
+        
+        for movie in details:
+            if movie is None:
+                continue
+            for name, values in columns.items():
+                values.append(movie.get(name))
         
         progress_bar.empty()
         status_text.empty()
         
-        df = pd.DataFrame(movies)
+        df = pd.DataFrame(columns)
+        
+        # Build full poster URLs in one vectorized pass (None where there is no poster,
+        # as object dtype so missing values don't turn into NaN)
+        poster_paths = df['poster_path']
+        df['poster_path'] = (
+            (self.IMAGE_BASE_URL + poster_paths.fillna('')).astype(object).where(poster_paths.notna(), None)
+        )
+        df = df.rename(columns={'poster_path': 'poster_url'})
         
         # If we got no data from API, fall back to sample dataset
         if df.empty:
             st.warning("⚠️ Could not load movies from TMDB API. Using sample dataset.")
             return self._load_sample_dataset()
         
-        # Clean data - only drop if columns exist
-        if 'overview' in df.columns and 'genres' in df.columns:
-            df = df.dropna(subset=['overview', 'genres'])
-        if 'vote_count' in df.columns:
-            df = df[df['vote_count'] >= 100]
+        # Clean data in a single pass: keep movies with an overview, genres and enough votes
+        mask = df['overview'].notna() & df['genres'].notna() & (df['vote_count'] >= 100)
+        df = df.loc[mask].reset_index(drop=True)
         
         # Final fallback if filtering removed all data
         if df.empty:
             st.warning("⚠️ No valid movies after filtering. Using sample dataset.")
             return self._load_sample_dataset()
         
-        return df
+        return _optimize_dtypes(df)
     
     def _load_sample_dataset(self) -> pd.DataFrame:
         """
@@ -194,197 +489,12 @@ class TMDBDataLoader:
         Returns:
             DataFrame with sample movie data
         """
-        # This is a small sample dataset for testing without API key
-        # In production, you might load from a CSV or use IMDb dataset
-        sample_movies = [
-            {
-                'id': 1,
-                'title': 'The Shawshank Redemption',
-                'year': '1994',
-                'overview': 'Two imprisoned men bond over a number of years, finding solace and eventual redemption through acts of common decency.',
-                'genres': ['Drama', 'Crime'],
-                'rating': 8.7,
-                'vote_count': 2000000,
-                'poster_url': None,
-                'director': 'Frank Darabont',
-                'cast': ['Tim Robbins', 'Morgan Freeman']
-            },
-            {
-                'id': 2,
-                'title': 'The Godfather',
-                'year': '1972',
-                'overview': 'The aging patriarch of an organized crime dynasty transfers control of his clandestine empire to his reluctant son.',
-                'genres': ['Drama', 'Crime'],
-                'rating': 8.7,
-                'vote_count': 1500000,
-                'poster_url': None,
-                'director': 'Francis Ford Coppola',
-                'cast': ['Marlon Brando', 'Al Pacino']
-            },
-            {
-                'id': 3,
-                'title': 'The Dark Knight',
-                'year': '2008',
-                'overview': 'When the menace known as the Joker wreaks havoc and chaos on the people of Gotham, Batman must accept one of the greatest psychological and physical tests of his ability to fight injustice.',
-                'genres': ['Action', 'Crime', 'Drama'],
-                'rating': 9.0,
-                'vote_count': 2500000,
-                'poster_url': None,
-                'director': 'Christopher Nolan',
-                'cast': ['Christian Bale', 'Heath Ledger', 'Aaron Eckhart']
-            },
-            {
-                'id': 4,
-                'title': 'Inception',
-                'year': '2010',
-                'overview': 'A thief who steals corporate secrets through dream-sharing technology is given the inverse task of planting an idea into the mind of a C.E.O.',
-                'genres': ['Action', 'Sci-Fi', 'Thriller'],
-                'rating': 8.8,
-                'vote_count': 2200000,
-                'poster_url': None,
-                'director': 'Christopher Nolan',
-                'cast': ['Leonardo DiCaprio', 'Joseph Gordon-Levitt', 'Elliot Page']
-            },
-            {
-                'id': 5,
-                'title': 'Pulp Fiction',
-                'year': '1994',
-                'overview': 'The lives of two mob hitmen, a boxer, a gangster and his wife, and a pair of diner bandits intertwine in four tales of violence and redemption.',
-                'genres': ['Crime', 'Drama'],
-                'rating': 8.9,
-                'vote_count': 1900000,
-                'poster_url': None,
-                'director': 'Quentin Tarantino',
-                'cast': ['John Travolta', 'Uma Thurman', 'Samuel L. Jackson']
-            },
-            {
-                'id': 6,
-                'title': 'Forrest Gump',
-                'year': '1994',
-                'overview': 'The presidencies of Kennedy and Johnson, the Vietnam War, the Watergate scandal and other historical events unfold from the perspective of an Alabama man with an IQ of 75.',
-                'genres': ['Drama', 'Romance'],
-                'rating': 8.8,
-                'vote_count': 1950000,
-                'poster_url': None,
-                'director': 'Robert Zemeckis',
-                'cast': ['Tom Hanks', 'Robin Wright', 'Gary Sinise']
-            },
-            {
-                'id': 7,
-                'title': 'The Matrix',
-                'year': '1999',
-                'overview': 'A computer hacker learns from mysterious rebels about the true nature of his reality and his role in the war against its controllers.',
-                'genres': ['Action', 'Sci-Fi'],
-                'rating': 8.7,
-                'vote_count': 1850000,
-                'poster_url': None,
-                'director': 'Lana Wachowski',
-                'cast': ['Keanu Reeves', 'Laurence Fishburne', 'Carrie-Anne Moss']
-            },
-            {
-                'id': 8,
-                'title': 'Interstellar',
-                'year': '2014',
-                'overview': 'A team of explorers travel through a wormhole in space in an attempt to ensure humanity\'s survival.',
-                'genres': ['Adventure', 'Drama', 'Sci-Fi'],
-                'rating': 8.6,
-                'vote_count': 1800000,
-                'poster_url': None,
-                'director': 'Christopher Nolan',
-                'cast': ['Matthew McConaughey', 'Anne Hathaway', 'Jessica Chastain']
-            },
-            {
-                'id': 9,
-                'title': 'Fight Club',
-                'year': '1999',
-                'overview': 'An insomniac office worker and a devil-may-care soap maker form an underground fight club that evolves into much more.',
-                'genres': ['Drama'],
-                'rating': 8.8,
-                'vote_count': 2000000,
-                'poster_url': None,
-                'director': 'David Fincher',
-                'cast': ['Brad Pitt', 'Edward Norton', 'Helena Bonham Carter']
-            },
-            {
-                'id': 10,
-                'title': 'Goodfellas',
-                'year': '1990',
-                'overview': 'The story of Henry Hill and his life in the mob, covering his relationship with his wife Karen Hill and his mob partners.',
-                'genres': ['Crime', 'Drama'],
-                'rating': 8.7,
-                'vote_count': 1100000,
-                'poster_url': None,
-                'director': 'Martin Scorsese',
-                'cast': ['Robert De Niro', 'Ray Liotta', 'Joe Pesci']
-            },
-            {
-                'id': 11,
-                'title': 'The Silence of the Lambs',
-                'year': '1991',
-                'overview': 'A young F.B.I. cadet must receive the help of an incarcerated and manipulative cannibal killer to help catch another serial killer.',
-                'genres': ['Crime', 'Drama', 'Thriller'],
-                'rating': 8.6,
-                'vote_count': 1300000,
-                'poster_url': None,
-                'director': 'Jonathan Demme',
-                'cast': ['Jodie Foster', 'Anthony Hopkins']
-            },
-            {
-                'id': 12,
-                'title': 'Gladiator',
-                'year': '2000',
-                'overview': 'A former Roman General sets out to exact vengeance against the corrupt emperor who murdered his family and sent him into slavery.',
-                'genres': ['Action', 'Adventure', 'Drama'],
-                'rating': 8.5,
-                'vote_count': 1400000,
-                'poster_url': None,
-                'director': 'Ridley Scott',
-                'cast': ['Russell Crowe', 'Joaquin Phoenix', 'Connie Nielsen']
-            },
-            {
-                'id': 13,
-                'title': 'The Prestige',
-                'year': '2006',
-                'overview': 'After a tragic accident, two stage magicians engage in a battle to create the ultimate illusion while sacrificing everything they have.',
-                'genres': ['Drama', 'Mystery', 'Sci-Fi'],
-                'rating': 8.5,
-                'vote_count': 1250000,
-                'poster_url': None,
-                'director': 'Christopher Nolan',
-                'cast': ['Christian Bale', 'Hugh Jackman', 'Scarlett Johansson']
-            },
-            {
-                'id': 14,
-                'title': 'The Departed',
-                'year': '2006',
-                'overview': 'An undercover cop and a mole in the police attempt to identify each other while infiltrating an Irish gang in South Boston.',
-                'genres': ['Crime', 'Drama', 'Thriller'],
-                'rating': 8.5,
-                'vote_count': 1200000,
-                'poster_url': None,
-                'director': 'Martin Scorsese',
-                'cast': ['Leonardo DiCaprio', 'Matt Damon', 'Jack Nicholson']
-            },
-            {
-                'id': 15,
-                'title': 'Saving Private Ryan',
-                'year': '1998',
-                'overview': 'Following the Normandy Landings, a group of U.S. soldiers go behind enemy lines to retrieve a paratrooper whose brothers have been killed in action.',
-                'genres': ['Drama', 'War'],
-                'rating': 8.6,
-                'vote_count': 1300000,
-                'poster_url': None,
-                'director': 'Steven Spielberg',
-                'cast': ['Tom Hanks', 'Matt Damon', 'Tom Sizemore']
-            }
-        ]
-        
         st.info(
             "📝 Using sample dataset. For full functionality with 500+ movies, "
             "add your TMDB API key to the .env file."
         )
         
-        return pd.DataFrame(sample_movies)
+        return _SAMPLE_MOVIES_DF.copy()
     
     def search_movies(self, query: str, limit: int = 10) -> List[Dict]:
         """
@@ -403,13 +513,18 @@ class TMDBDataLoader:
         response = self._make_request("/search/movie", {'query': query})
         results = response.get('results', [])[:limit]
         
+        # Fetch the results' details concurrently, keeping search order
         movies = []
-        for movie_data in results:
-            try:
-                movie = self.get_movie_details(movie_data['id'])
+        with self._executor() as executor:
+            futures = [executor.submit(self.get_movie_details, movie_data['id']) for movie_data in results]
+            for future in futures:
+                try:
+                    movie = future.result()
+                except Exception:
+                    continue
+                poster_path = movie.pop('poster_path')
+                movie['poster_url'] = f"{self.IMAGE_BASE_URL}{poster_path}" if poster_path else None
                 movies.append(movie)
-            except Exception:
-                continue
         
         return movies
 
@@ -442,31 +557,36 @@ class IMDbDataLoader:
         Returns:
             DataFrame with movie information
         """
-        # Load basics
-        basics = pd.read_csv(
+        # Load basics, keeping only the movie rows of the columns we use
+        basics_reader = pd.read_csv(
             f"{self.data_path}/title.basics.tsv.gz",
             sep='\t',
-            low_memory=False
+            usecols=['tconst', 'titleType', 'primaryTitle', 'startYear', 'genres'],
+            index_col='tconst',
+            dtype={'titleType': 'category', 'startYear': 'string', 'genres': 'string'},
+            na_values='\\N',
+            chunksize=500_000
+        )
+        movies = pd.concat(
+            chunk.loc[chunk['titleType'] == 'movie', ['primaryTitle', 'startYear', 'genres']]
+            for chunk in basics_reader
         )
         
-        # Load ratings
+        # Load ratings and drop low-vote titles before the merge
         ratings = pd.read_csv(
             f"{self.data_path}/title.ratings.tsv.gz",
-            sep='\t'
+            sep='\t',
+            usecols=['tconst', 'averageRating', 'numVotes'],
+            index_col='tconst',
+            dtype={'averageRating': 'float32', 'numVotes': 'int32'}
         )
+        ratings = ratings.query('numVotes >= @min_votes')
         
-        # Filter for movies only
-        movies = basics[basics['titleType'] == 'movie'].copy()
-        
-        # Merge with ratings
-        movies = movies.merge(ratings, on='tconst', how='inner')
+        # Join with ratings on the shared tconst index
+        movies = movies.join(ratings, how='inner')
         
-        # Filter by votes and sort by rating
-        movies = movies[movies['numVotes'] >= min_votes]
-        movies = movies.sort_values('averageRating', ascending=False)
-        
-        # Limit results
-        movies = movies.head(limit)
+        # Keep the top rated movies
+        movies = movies.nlargest(limit, 'averageRating')
         
         # Rename columns to match our schema
         movies = movies.rename(columns={
@@ -478,15 +598,18 @@ class IMDbDataLoader:
         })
         
         # Process genres (split comma-separated string into list)
-        movies['genres'] = movies['genres'].apply(
-            lambda x: x.split(',') if pd.notna(x) and x != '\\N' else []
-        )
+        genres = movies['genres'].str.split(',')
+        missing = genres.isna()
+        genres[missing] = pd.Series([[] for _ in range(missing.sum())], index=genres.index[missing])
+        movies['genres'] = genres
+        
+        movies['year'] = _to_year(movies['year'])
         
-        # Add placeholder columns
+        # Add placeholder columns (only for the rows we keep)
         movies['overview'] = ''  # IMDb basic dataset doesn't include overviews
         movies['director'] = None
-        movies['cast'] = []
+        movies['cast'] = [[] for _ in range(len(movies))]
         movies['poster_url'] = None
         
         return movies[['title', 'year', 'overview', 'genres', 'rating', 
-                      'vote_count', 'poster_url', 'director', 'cast']]
+                      'vote_count', 'poster_url', 'director', 'cast']].reset_index(drop=True)
@@ -0,0 +1,131 @@
+"""
+Movie Cache Module
+Reads and writes the local movie cache and cached TMDB responses,
+and sets up TMDB sessions.
+Shared by the Streamlit app and the cache-building scripts.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the standard library
+    orjson = None
+
+CACHE_FILE = "movies_cache.json"
+
+
+def create_session(max_workers: int = 10) -> requests.Session:
+    """
+    Create a session that reuses pooled keep-alive connections for TMDB calls.
+
+    Rate-limited and failed requests are retried with backoff; once retries
+    run out the error response is returned so callers can report it.
+
+    Args:
+        max_workers: Number of threads that will share the session
+
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=max_workers,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                          raise_on_status=False)
+    ))
+    return session
+
+
+def parse_json(response: requests.Response):
+    """Decode a JSON response body, using orjson when available."""
+    if orjson:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _open_cache(path: str, mode: str, **kwargs):
+    """Open a cache file, transparently (de)compressing `.gz` paths."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, **kwargs)
+    return open(path, mode, **kwargs)
+
+
+def load_cache(path: str = CACHE_FILE) -> list:
+    """Load the list of cached movies from a JSON (or gzipped JSON) cache file."""
+    if orjson:
+        with _open_cache(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with _open_cache(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_cache(movies: list, path: str = CACHE_FILE):
+    """
+    Write the list of movies to a compact (unindented) JSON cache file.
+    Paths ending in `.gz` are written gzip-compressed.
+    """
+    if orjson:
+        with _open_cache(path, 'wb') as f:
+            f.write(orjson.dumps(movies))
+    else:
+        # Encode in one shot; json.dump would issue a write per encoder chunk
+        with _open_cache(path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps(movies, ensure_ascii=False, separators=(',', ':')))
+
+
+def read_cached_json(path: str, ttl: float):
+    """
+    Read an on-disk cache entry if it is younger than `ttl` seconds.
+    
+    Args:
+        path: Cache file
+        ttl: Maximum age of the entry in seconds
+        
+    Returns:
+        The cached JSON value, or None if the entry is missing, stale or unreadable
+    """
+    try:
+        if time.time() - os.path.getmtime(path) < ttl:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass  # Missing or unreadable entry - the caller fetches it again
+    return None
+
+
+def write_cached_json(path: str, data):
+    """
+    Save a JSON value to an on-disk cache entry, if the filesystem allows it.
+    
+    The file is written under a temporary name and then renamed into place,
+    so readers (and concurrent writers of the same entry) never see a partially
+    written file. Failures (read-only or full disk) are ignored - the cache is
+    only an optimization.
+    
+    Args:
+        path: Cache file
+        data: JSON-serializable value to store
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
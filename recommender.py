@@ -3,11 +3,14 @@ Movie Recommendation Engine
 Implements content-based filtering using TF-IDF and cosine similarity
 """
 
+import threading
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Tuple
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import MultiLabelBinarizer
 import streamlit as st
 
 
@@ -22,6 +25,11 @@ class MovieRecommender:
     - Cast (15%): Member overlap
     """
     
+    # Movie fields returned with each recommendation (those present in the data)
+    MOVIE_FIELDS = ('id', 'title', 'year', 'overview', 'genres', 'rating',
+                    'vote_count', 'poster_url', 'director', 'cast')
+    SIMILARITY_CACHE_SIZE = 64  # Recent selections whose similarity scores are kept (~50 KB each)
+    
     def __init__(self, movie_data: pd.DataFrame):
         """
         Initialize the recommender with movie data.
@@ -29,149 +37,243 @@ class MovieRecommender:
         Args:
             movie_data: DataFrame with columns: title, overview, genres, director, cast, etc.
         """
-        self.movie_data = movie_data.copy()
+        # The recommender never modifies movie_data, so no copy is taken; only the index is
+        # normalized so row positions line up with the similarity arrays
+        self.movie_data = movie_data.reset_index(drop=True)
         self.tfidf_matrix = None
         self.tfidf_vectorizer = None
+        self.genre_matrix = None
+        self.genre_counts = None
+        self.cast_matrix = None
+        self.director_matrix = None
+        
+        # LRU of similarity scores keyed by selection (the recommender is shared across sessions)
+        self._similarity_cache = OrderedDict()
+        self._similarity_cache_lock = threading.Lock()
+        
+        # Title -> row position (first match wins for duplicate titles)
+        self._title_to_index = {}
+        for i, title in enumerate(self.movie_data['title']):
+            self._title_to_index.setdefault(title, i)
+        
+        # Per-movie attributes for explanations, pulled out of the DataFrame once
+        self._directors = self.movie_data['director'].tolist()
+        self._genre_sets = [set(g) if isinstance(g, list) else set() for g in self.movie_data['genres']]
+        self._cast_sets = [set(c[:5]) if isinstance(c, list) else set() for c in self.movie_data['cast']]
+        
+        # Recommendation payload columns as plain Python lists, so building a result
+        # doesn't go through a per-row Series
+        self._movie_fields = {
+            field: self.movie_data[field].tolist()
+            for field in self.MOVIE_FIELDS if field in self.movie_data.columns
+        }
         
         # Precompute TF-IDF matrix for plot descriptions
         self._build_tfidf_matrix()
+        
+        # Precompute sparse indicator matrices for the metadata features
+        self._build_feature_matrices()
     
     def _build_tfidf_matrix(self):
         """Build TF-IDF matrix from movie plot descriptions."""
-        # Combine overview with genres for richer text features
-        self.movie_data['combined_features'] = (
-            self.movie_data['overview'].fillna('') + ' ' +
-            self.movie_data['genres'].apply(lambda x: ' '.join(x) if isinstance(x, list) else '')
-        )
+        # Combine overview with genres for richer text features, streamed straight
+        # into the vectorizer so the combined text is never stored as a column
+        def _iter_docs():
+            for overview, genres in zip(self.movie_data['overview'].to_numpy(),
+                                        self.movie_data['genres'].to_numpy()):
+                yield ((overview if isinstance(overview, str) else '') + ' ' +
+                       (' '.join(genres) if isinstance(genres, list) else ''))
         
         # Create TF-IDF vectorizer
         self.tfidf_vectorizer = TfidfVectorizer(
             max_features=5000,
             stop_words='english',
             ngram_range=(1, 2),  # Include bigrams for better context
-            min_df=2  # Minimum document frequency
+            min_df=2,  # Minimum document frequency
+            dtype=np.float32  # Single precision is plenty for similarity scores
         )
         
         # Fit and transform
-        self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(
-            self.movie_data['combined_features']
+        self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(_iter_docs())
+    
+    def _build_feature_matrices(self):
+        """Build binary movie x genre / movie x cast / movie x director indicator matrices."""
+        genres = [g if isinstance(g, list) else [] for g in self.movie_data['genres']]
+        self.genre_matrix = sparse.csr_matrix(
+            MultiLabelBinarizer(sparse_output=True).fit_transform(genres), dtype=np.float32
+        )
+        self.genre_counts = self.genre_matrix.sum(axis=1).A1  # Genres per movie, for Jaccard unions
+        
+        cast = [c[:5] if isinstance(c, list) else [] for c in self.movie_data['cast']]  # Top 5 cast members
+        self.cast_matrix = sparse.csr_matrix(
+            MultiLabelBinarizer(sparse_output=True).fit_transform(cast), dtype=np.float32
+        )
+        
+        # Movies without a director (code -1) get an empty row, so they never match
+        codes = pd.Categorical(self.movie_data['director']).codes
+        rows = np.flatnonzero(codes >= 0)
+        self.director_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, codes[rows])), shape=(len(codes), codes.max() + 1)
         )
     
-    def _calculate_plot_similarity(self, movie_indices: List[int]) -> np.ndarray:
+    def _selection_matrix(self, selections: List[List[int]]) -> sparse.csr_matrix:
         """
-        Calculate cosine similarity based on plot descriptions.
+        Build a sparse selections x movies matrix with a 1 for each selected movie.
         
         Args:
-            movie_indices: List of movie indices to compare against
+            selections: One list of selected movie indices per query
             
         Returns:
-            Array of similarity scores for all movies
+            CSR matrix of shape (len(selections), number of movies)
         """
-        # Get TF-IDF vectors for selected movies
-        selected_vectors = self.tfidf_matrix[movie_indices]
-        
-        # Calculate cosine similarity with all movies
-        similarities = cosine_similarity(selected_vectors, self.tfidf_matrix)
-        
-        # Average similarity across selected movies
-        avg_similarity = similarities.mean(axis=0)
+        rows = np.repeat(np.arange(len(selections)), [len(indices) for indices in selections])
+        cols = np.concatenate(selections)
+        return sparse.csr_matrix(
+            (np.ones(len(cols), dtype=np.float32), (rows, cols)), shape=(len(selections), len(self.movie_data))
+        )
+    
+    @staticmethod
+    def _selected_union(selection: sparse.csr_matrix, feature_matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+        """Union of the selected movies' features, one 0/1 row per query."""
+        union = selection @ feature_matrix
+        union.data[:] = 1
+        return union
+    
+    def _calculate_plot_similarity(self, selection: sparse.csr_matrix) -> np.ndarray:
+        """
+        Calculate cosine similarity based on plot descriptions.
         
-        return avg_similarity
+        Args:
+            selection: Selected movies per query (see _selection_matrix)
+            
+        Returns:
+            Array of similarity scores, one column per query
+        """
+        # TF-IDF rows are already L2-normalized, so cosine similarity is a plain dot product.
+        # Averaging over the selected movies is linear, so average their rows into one query
+        # vector per selection and do a single matrix product for all of them. Scaling the
+        # sparse queries is much cheaper than dividing the dense result afterwards.
+        queries = selection @ self.tfidf_matrix
+        queries.data /= np.repeat(selection.sum(axis=1).A1, np.diff(queries.indptr))
+        
+        return (self.tfidf_matrix @ queries.T).toarray()
     
-    def _calculate_genre_similarity(self, movie_indices: List[int]) -> np.ndarray:
+    def _calculate_genre_similarity(self, selected_genres: sparse.csr_matrix) -> np.ndarray:
         """
         Calculate genre overlap similarity.
         
         Args:
-            movie_indices: List of movie indices to compare against
+            selected_genres: Union of each query's selected genres (see _selected_union)
             
         Returns:
-            Array of genre similarity scores (Jaccard similarity)
+            Array of genre similarity scores (Jaccard similarity), one column per query
         """
-        similarities = np.zeros(len(self.movie_data))
-        
-        # Get genres of selected movies
-        selected_genres = []
-        for idx in movie_indices:
-            genres = self.movie_data.iloc[idx]['genres']
-            if isinstance(genres, list):
-                selected_genres.extend(genres)
-        selected_genres = set(selected_genres)
-        
-        # Calculate Jaccard similarity for each movie
-        for pos, (i, row) in enumerate(self.movie_data.iterrows()):
-            movie_genres = set(row['genres']) if isinstance(row['genres'], list) else set()
-            
-            if not movie_genres or not selected_genres:
-                similarities[pos] = 0
-            else:
-                intersection = len(selected_genres.intersection(movie_genres))
-                union = len(selected_genres.union(movie_genres))
-                similarities[pos] = intersection / union if union > 0 else 0
-        
-        return similarities
+        if selected_genres.nnz == 0:
+            return np.zeros((len(self.movie_data), selected_genres.shape[0]), dtype=np.float32)
+        
+        # Jaccard similarity against every movie: |A & B| / |A | B|
+        intersection = (self.genre_matrix @ selected_genres.T).toarray()
+        union = self.genre_counts[:, None] + selected_genres.sum(axis=1).A1 - intersection
+        
+        return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
     
-    def _calculate_director_similarity(self, movie_indices: List[int]) -> np.ndarray:
+    def _calculate_director_similarity(self, selected_directors: sparse.csr_matrix) -> np.ndarray:
         """
         Calculate director match similarity (binary: 1 if match, 0 otherwise).
         
         Args:
-            movie_indices: List of movie indices to compare against
+            selected_directors: Each query's selected directors (see _selected_union)
             
         Returns:
-            Array of director similarity scores
+            Array of director similarity scores, one column per query
         """
-        similarities = np.zeros(len(self.movie_data))
+        if selected_directors.nnz == 0:
+            return np.zeros((len(self.movie_data), selected_directors.shape[0]), dtype=np.float32)
         
-        # Get directors of selected movies
-        selected_directors = set()
-        for idx in movie_indices:
-            director = self.movie_data.iloc[idx]['director']
-            if pd.notna(director):
-                selected_directors.add(director)
+        # Each movie has at most one director, so the product is already 0/1
+        return (self.director_matrix @ selected_directors.T).toarray()
+    
+    def _calculate_cast_similarity(self, selected_cast: sparse.csr_matrix) -> np.ndarray:
+        """
+        Calculate cast overlap similarity.
+        
+        Args:
+            selected_cast: Union of each query's selected top cast (see _selected_union)
+            
+        Returns:
+            Array of cast similarity scores, one column per query
+        """
+        if selected_cast.nnz == 0:
+            return np.zeros((len(self.movie_data), selected_cast.shape[0]), dtype=np.float32)
         
-        # Check each movie's director
-        for pos, (i, row) in enumerate(self.movie_data.iterrows()):
-            if pd.notna(row['director']) and row['director'] in selected_directors:
-                similarities[pos] = 1.0
+        # Shared cast members, normalized by max possible overlap (folded into the query)
+        return (self.cast_matrix @ (selected_cast.T * np.float32(1 / 5))).toarray()
+    
+    def _combined_similarity(self, selections: List[List[int]]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Calculate the weighted similarity of every movie to each query's selected movies.
         
-        return similarities
+        Args:
+            selections: One non-empty list of selected movie indices per query
+            
+        Returns:
+            Tuple of (combined similarity scores, unweighted component scores by name),
+            each an array with one row per movie and one column per query
+        """
+        selection = self._selection_matrix(selections)
+        components = {
+            'plot': self._calculate_plot_similarity(selection),
+            'genre': self._calculate_genre_similarity(self._selected_union(selection, self.genre_matrix)),
+            'director': self._calculate_director_similarity(self._selected_union(selection, self.director_matrix)),
+            'cast': self._calculate_cast_similarity(self._selected_union(selection, self.cast_matrix))
+        }
+        
+        # Weighted sum, accumulated in place
+        combined = components['plot'] * np.float32(0.40)
+        combined += components['genre'] * np.float32(0.30)
+        combined += components['director'] * np.float32(0.15)
+        combined += components['cast'] * np.float32(0.15)
+        
+        return combined, components
     
-    def _calculate_cast_similarity(self, movie_indices: List[int]) -> np.ndarray:
+    def _cached_similarities(self, selections: List[List[int]]) -> List[Tuple[np.ndarray, Dict[str, np.ndarray]]]:
         """
-        Calculate cast overlap similarity.
+        Get each selection's similarity scores, computing only those not already cached.
+        
+        Scores don't depend on the order of the selected movies, so the cache key
+        is the sorted selection.
         
         Args:
-            movie_indices: List of movie indices to compare against
+            selections: One non-empty list of selected movie indices per query
             
         Returns:
-            Array of cast similarity scores
+            (combined scores, unweighted component scores) per selection; treat as read-only
         """
-        similarities = np.zeros(len(self.movie_data))
-        
-        # Get cast members of selected movies
-        selected_cast = []
-        for idx in movie_indices:
-            cast = self.movie_data.iloc[idx]['cast']
-            if isinstance(cast, list):
-                selected_cast.extend(cast[:5])  # Top 5 cast members
-        selected_cast = set(selected_cast)
-        
-        # Calculate overlap for each movie
-        for pos, (i, row) in enumerate(self.movie_data.iterrows()):
-            movie_cast = set(row['cast'][:5]) if isinstance(row['cast'], list) else set()
+        keys = [tuple(sorted(movie_indices)) for movie_indices in selections]
+        
+        with self._similarity_cache_lock:
+            missing = [key for key in dict.fromkeys(keys) if key not in self._similarity_cache]
+            if missing:
+                combined, components = self._combined_similarity([list(key) for key in missing])
+                for col, key in enumerate(missing):
+                    self._similarity_cache[key] = (
+                        combined[:, col].copy(),
+                        {name: scores[:, col].copy() for name, scores in components.items()}
+                    )
+            
+            results = []
+            for key in keys:
+                self._similarity_cache.move_to_end(key)
+                results.append(self._similarity_cache[key])
             
-            if not movie_cast or not selected_cast:
-                similarities[pos] = 0
-            else:
-                overlap = len(selected_cast.intersection(movie_cast))
-                similarities[pos] = overlap / 5.0  # Normalize by max possible overlap
+            while len(self._similarity_cache) > self.SIMILARITY_CACHE_SIZE:
+                self._similarity_cache.popitem(last=False)
         
-        return similarities
+        return results
     
     def _generate_explanation(self, selected_movies: List[str], 
                               movie_indices: List[int],
-                              recommended_movie: pd.Series,
+                              recommended_index: int,
                               similarity_components: Dict[str, float]) -> str:
         """
         Generate a human-readable explanation for why a movie was recommended.
@@ -179,7 +281,7 @@ class MovieRecommender:
         Args:
             selected_movies: List of selected movie titles
             movie_indices: Indices of selected movies in the dataframe
-            recommended_movie: Series containing recommended movie data
+            recommended_index: Index of the recommended movie in the dataframe
             similarity_components: Dictionary with component similarities
             
         Returns:
@@ -188,9 +290,9 @@ class MovieRecommender:
         explanations = []
         
         # Get recommended movie's attributes
-        rec_director = recommended_movie.get('director')
-        rec_cast = set(recommended_movie.get('cast', [])[:5]) if isinstance(recommended_movie.get('cast'), list) else set()
-        rec_genres = set(recommended_movie.get('genres', [])) if isinstance(recommended_movie.get('genres'), list) else set()
+        rec_director = self._directors[recommended_index]
+        rec_cast = self._cast_sets[recommended_index]
+        rec_genres = self._genre_sets[recommended_index]
         
         # Track which selected movie matches for each component
         director_match_movie = None
@@ -200,17 +302,16 @@ class MovieRecommender:
         
         # Check each selected movie for matches
         for i, idx in enumerate(movie_indices):
-            selected_movie_data = self.movie_data.iloc[idx]
-            sel_director = selected_movie_data.get('director')
-            sel_cast = set(selected_movie_data.get('cast', [])[:5]) if isinstance(selected_movie_data.get('cast'), list) else set()
-            sel_genres = set(selected_movie_data.get('genres', [])) if isinstance(selected_movie_data.get('genres'), list) else set()
+            sel_director = self._directors[idx]
+            sel_cast = self._cast_sets[idx]
+            sel_genres = self._genre_sets[idx]
             
             # Director match
             if rec_director and sel_director and rec_director == sel_director:
                 director_match_movie = selected_movies[i]
             
             # Cast overlap
-            if rec_cast and sel_cast and len(rec_cast.intersection(sel_cast)) > 0:
+            if not rec_cast.isdisjoint(sel_cast):
                 cast_match_movie = selected_movies[i]
             
             # Genre overlap - track best match
@@ -243,7 +344,7 @@ class MovieRecommender:
             explanations.append(f"Shares genres: {', '.join(best_genre_overlap[:2])}")
         
         if similarity_components.get('director', 0) > 0.9:
-            explanations.append(f"Same director: {recommended_movie['director']}")
+            explanations.append(f"Same director: {rec_director}")
         
         if similarity_components.get('cast', 0) > 0.2:
             explanations.append("Features similar actors")
@@ -272,53 +373,86 @@ class MovieRecommender:
         Returns:
             List of recommendation dictionaries with movie info and explanations
         """
-        # Get indices of selected movies
-        movie_indices = []
-        for title in selected_titles:
-            matching_movies = self.movie_data[self.movie_data['title'] == title]
-            if not matching_movies.empty:
-                movie_indices.append(matching_movies.index[0])
-        
-        if not movie_indices:
-            return []
+        return self.get_recommendations_batch([selected_titles], n_recommendations)[0]
+    
+    def get_recommendations_batch(self, selections: List[List[str]],
+                                  n_recommendations: int = 5) -> List[List[Dict]]:
+        """
+        Generate recommendations for several users' selections at once.
         
-        # Calculate component similarities with weights
-        plot_sim = self._calculate_plot_similarity(movie_indices) * 0.40
-        genre_sim = self._calculate_genre_similarity(movie_indices) * 0.30
-        director_sim = self._calculate_director_similarity(movie_indices) * 0.15
-        cast_sim = self._calculate_cast_similarity(movie_indices) * 0.15
+        Similarity scores for all selections are computed together, with one
+        sparse matrix product per component rather than one pass per user.
         
-        # Combine into final similarity score
-        combined_similarity = plot_sim + genre_sim + director_sim + cast_sim
+        Args:
+            selections: One list of liked movie titles per user
+            n_recommendations: Number of recommendations to return per user
+            
+        Returns:
+            One list of recommendation dictionaries per selection (empty if none of its titles are known)
+        """
+        # Get indices of each user's selected movies
+        all_indices = [
+            [self._title_to_index[title] for title in selected_titles if title in self._title_to_index]
+            for selected_titles in selections
+        ]
+        results = [[] for _ in selections]
+        queries = [i for i, movie_indices in enumerate(all_indices) if movie_indices]
+        
+        if not queries:
+            return results
+        
+        # Calculate weighted similarity scores (and their components for the explanations)
+        similarities = self._cached_similarities([all_indices[i] for i in queries])
+        
+        for i, (combined, components) in zip(queries, similarities):
+            results[i] = self._top_recommendations(
+                selections[i],
+                all_indices[i],
+                combined.copy(),
+                components,
+                n_recommendations
+            )
+        
+        return results
+    
+    def _top_recommendations(self, selected_titles: List[str], movie_indices: List[int],
+                             combined_similarity: np.ndarray, components: Dict[str, np.ndarray],
+                             n_recommendations: int) -> List[Dict]:
+        """
+        Pick the top-scoring movies for one query and explain them.
         
+        Args:
+            selected_titles: List of movie titles the user likes
+            movie_indices: Indices of the selected movies in the dataframe
+            combined_similarity: Combined score of every movie (modified in place)
+            components: Unweighted component scores of every movie
+            n_recommendations: Number of recommendations to return
+            
+        Returns:
+            List of recommendation dictionaries with movie info and explanations
+        """
         # Exclude already selected movies
-        for idx in movie_indices:
-            combined_similarity[idx] = -1
+        combined_similarity[movie_indices] = -1
         
-        # Get top N recommendations
-        top_indices = np.argsort(combined_similarity)[::-1][:n_recommendations]
+        # Get top N recommendations (partial selection, then sort just those N)
+        n_top = min(n_recommendations, len(combined_similarity))
+        top_indices = np.argpartition(-combined_similarity, n_top - 1)[:n_top]
+        top_indices = top_indices[np.argsort(-combined_similarity[top_indices])]
         
         # Build recommendation list with explanations
         recommendations = []
         for idx in top_indices:
             if combined_similarity[idx] > 0:  # Only include positive matches
-                movie = self.movie_data.iloc[idx]
-                
                 # Store component scores for explanation
-                component_scores = {
-                    'plot': plot_sim[idx] / 0.40,
-                    'genre': genre_sim[idx] / 0.30,
-                    'director': director_sim[idx] / 0.15,
-                    'cast': cast_sim[idx] / 0.15
-                }
+                component_scores = {name: scores[idx] for name, scores in components.items()}
                 
                 recommendations.append({
-                    'movie': movie.to_dict(),
+                    'movie': {field: values[idx] for field, values in self._movie_fields.items()},
                     'similarity_score': combined_similarity[idx],
                     'explanation': self._generate_explanation(
                         selected_titles,
                         movie_indices,
-                        movie,
+                        idx,
                         component_scores
                     )
                 })
@@ -6,6 +6,13 @@ Helper functions for data processing, validation, and formatting
 import pandas as pd
 from typing import List, Dict, Optional
 import re
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+
+# Patterns used by clean_text, compiled once
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s.,!?-]')
 
 
 def validate_movie_selection(selected_movies: List[str], 
@@ -30,9 +37,10 @@ def validate_movie_selection(selected_movies: List[str],
     if len(selected_movies) != len(set(selected_movies)):
         return False, "You've selected duplicate movies. Please choose different films."
     
-    # Check if all movies exist in dataset
+    # Check if all movies exist in dataset (set lookup instead of scanning the list)
+    available = set(available_movies)
     for movie in selected_movies:
-        if movie not in available_movies:
+        if movie not in available:
             return False, f"Movie '{movie}' not found in database"
     
     return True, ""
@@ -85,6 +93,22 @@ def format_currency(amount: Optional[float]) -> str:
         return f"${amount:.0f}"
 
 
+def format_year(year: Optional[int]) -> str:
+    """
+    Format a release year for display.
+    
+    Args:
+        year: Release year (nullable integer; missing values are None/NaN/<NA>)
+        
+    Returns:
+        Formatted string (e.g., "1994") or "N/A"
+    """
+    if pd.isna(year):
+        return "N/A"
+    
+    return str(int(year))
+
+
 def clean_text(text: str) -> str:
     """
     Clean text for display (remove extra whitespace, special characters).
@@ -99,10 +123,10 @@ def clean_text(text: str) -> str:
         return ""
     
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
     
     # Remove special characters but keep punctuation
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    text = _SPECIAL_CHARS_RE.sub('', text)
     
     return text.strip()
 
@@ -162,15 +186,12 @@ def get_genre_distribution(movies: List[Dict]) -> Dict[str, int]:
     Returns:
         Dictionary mapping genre to count
     """
-    genre_counts = {}
-    
-    for movie in movies:
-        genres = movie.get('genres', [])
-        if isinstance(genres, list):
-            for genre in genres:
-                genre_counts[genre] = genre_counts.get(genre, 0) + 1
+    genre_counts = Counter(chain.from_iterable(
+        genres for genres in (movie.get('genres', []) for movie in movies)
+        if isinstance(genres, list)
+    ))
     
-    return dict(sorted(genre_counts.items(), key=lambda x: x[1], reverse=True))
+    return dict(genre_counts.most_common())
 
 
 def create_movie_fingerprint(movie: Dict) -> str:
@@ -184,11 +205,13 @@ def create_movie_fingerprint(movie: Dict) -> str:
     Returns:
         Fingerprint string
     """
-    title = movie.get('title', '').lower().strip()
-    year = movie.get('year', '')
-    director = movie.get('director', '').lower().strip()
-    
-    return f"{title}_{year}_{director}"
+    return _fingerprint(movie.get('title', ''), movie.get('year', ''), movie.get('director', ''))
+
+
+@lru_cache(maxsize=4096)
+def _fingerprint(title: str, year, director: str) -> str:
+    """Build (and memoize) the fingerprint string for create_movie_fingerprint."""
+    return f"{title.lower().strip()}_{year}_{director.lower().strip()}"
 
 
 def filter_by_rating(movies: pd.DataFrame, 
@@ -208,7 +231,7 @@ def filter_by_rating(movies: pd.DataFrame,
     return movies[
         (movies['rating'] >= min_rating) & 
         (movies['rating'] <= max_rating)
-    ].copy()
+    ]
 
 
 def filter_by_year(movies: pd.DataFrame,
@@ -225,13 +248,14 @@ def filter_by_year(movies: pd.DataFrame,
     Returns:
         Filtered DataFrame
     """
-    filtered = movies.copy()
+    filtered = movies
     
+    # year is a nullable integer column; movies without a year never match
     if start_year:
-        filtered = filtered[filtered['year'] >= str(start_year)]
+        filtered = filtered[filtered['year'].ge(start_year).fillna(False)]
     
     if end_year:
-        filtered = filtered[filtered['year'] <= str(end_year)]
+        filtered = filtered[filtered['year'].le(end_year).fillna(False)]
     
     return filtered
 
@@ -249,7 +273,7 @@ def filter_family_friendly(movies: pd.DataFrame) -> pd.DataFrame:
     """
     if 'rating_mpaa' in movies.columns:
         family_ratings = ['G', 'PG', 'PG-13']
-        return movies[movies['rating_mpaa'].isin(family_ratings)].copy()
+        return movies[movies['rating_mpaa'].isin(family_ratings)]
     else:
         # Fallback: filter by genre
         return movies[
@@ -257,7 +281,7 @@ def filter_family_friendly(movies: pd.DataFrame) -> pd.DataFrame:
                 lambda x: any(g in ['Animation', 'Family', 'Adventure'] 
                             for g in x if isinstance(x, list))
             )
-        ].copy()
+        ]
 
 
 def export_recommendations_csv(recommendations: List[Dict], 
@@ -287,6 +311,7 @@ def export_recommendations_csv(recommendations: List[Dict],
     return filepath
 
 
+@lru_cache(maxsize=4096)
 def get_decade(year: str) -> Optional[str]:
     """
     Get the decade from a year string.